@@ -1,8 +1,25 @@
-import io
 import gradio as gr
+import os
 import tempfile
+import threading
+import xlsxwriter
+from concurrent.futures import ThreadPoolExecutor
 
-from uniprot_data import create_dataframe, get_uniprot_data
+from uniprot_data import (
+    create_dataframe,
+    fetch_uniprot_xml,
+    get_uniprot_data,
+    local_xml_path,
+)
+
+# Example UniProt IDs offered in the interface, with their labels
+EXAMPLES = [
+    ("P06280", "Alpha-galactosidase A"),
+    ("P07550", "Beta-2 adrenergic receptor"),
+    ("P01308", "Insulin"),
+    ("Q8WZ42", "Titin"),
+    ("P0DTC2", "SARS-CoV-2 Spike protein"),
+]
 
 
 def process_uniprot_id(uniprot_id):
@@ -17,15 +34,43 @@ def process_uniprot_id(uniprot_id):
     """
     protein_sequence, annotations = get_uniprot_data(uniprot_id)
 
-    if protein_sequence and annotations:
+    if protein_sequence:
         df = create_dataframe(protein_sequence, annotations)
         # Create Excel file
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
-        df.to_excel(temp_file.name, index=False)
+        # Stream rows with xlsxwriter's constant-memory mode rather than
+        # building the whole sheet in memory
+        with xlsxwriter.Workbook(temp_file.name, {"constant_memory": True}) as workbook:
+            worksheet = workbook.add_worksheet()
+            worksheet.write_row(0, 0, df.columns)
+            for row_number, row in enumerate(df.iter_rows(), start=1):
+                worksheet.write_row(row_number, 0, row)
         return df, temp_file.name
     return "Could not retrieve or process data for the given Uniprot ID", None
 
 
+def prefetch_examples():
+    """
+    Warms the UniProt cache for the example IDs in a background thread.
+
+    IDs with a bundled XML file have nothing to fetch and are skipped. Failed
+    fetches are ignored; they are simply retried when clicked.
+    """
+    uniprot_ids = [
+        uniprot_id
+        for uniprot_id, _ in EXAMPLES
+        if not os.path.exists(local_xml_path(uniprot_id))
+    ]
+    if not uniprot_ids:
+        return
+
+    def run():
+        with ThreadPoolExecutor(max_workers=len(uniprot_ids)) as executor:
+            executor.map(fetch_uniprot_xml, uniprot_ids)
+
+    threading.Thread(target=run, daemon=True).start()
+
+
 # Gradio Interface
 with gr.Blocks() as demo:
     with gr.Column():
@@ -42,20 +87,8 @@ with gr.Blocks() as demo:
 
         # Add examples
         gr.Examples(
-            examples=[
-                ["P06280"],  # Alpha-galactosidase A
-                ["P07550"],  # beta-2 AR
-                ["P01308"],  # Insulin
-                ["Q8WZ42"],  # Titin
-                ["P0DTC2"],  # SARS-CoV-2 Spike protein
-            ],
-            example_labels=[
-                "Alpha-galactosidase A",
-                "Beta-2 adrenergic receptor",
-                "Insulin",
-                "Titin",
-                "SARS-CoV-2 Spike protein",
-            ],
+            examples=[[uniprot_id] for uniprot_id, _ in EXAMPLES],
+            example_labels=[label for _, label in EXAMPLES],
             inputs=input_text,
             label="Example UniProt IDs",
         )
@@ -70,4 +103,5 @@ with gr.Blocks() as demo:
         )
 
 if __name__ == "__main__":
+    prefetch_examples()
     demo.launch()
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from uniprot_data import create_dataframe, get_uniprot_data  # noqa: E402
+
+# SHA-256 of the table built by the original implementation for each bundled
+# entry, so rewrites of the parser and table builder must match it cell for cell
+BASELINE_DIGESTS = {
+    "P01308": "9ab9dc893324fc09b77ffcf1a0de00bfd94e5de9ba9bad24556716fcac27613b",
+    "P06280": "d125045c302a5d1d6b19cc93bc5c41c1b67a8aa1035d499781b9be04a260b6c8",
+    "P07550": "da5d91624f51523b0bc897c270a9fb06005a9be63fe5a11f898d0d33b206f237",
+}
+
+SYNTHETIC_ENTRY = """<?xml version="1.0" encoding="UTF-8"?>
+<uniprot xmlns="http://uniprot.org/uniprot">
+<entry>
+  <comment type="alternative products">
+    <isoform>
+      <id>SYN-1</id>
+      <sequence type="displayed"/>
+    </isoform>
+  </comment>
+  <feature type="disulfide bond" description="Interchain (with C-12)">
+    <location><position position="3"/></location>
+  </feature>
+  <feature type="disulfide bond">
+    <location><begin position="2"/><end position="5"/></location>
+  </feature>
+  <feature type="glycosylation site" description="N-linked">
+    <location><position position="1"/></location>
+  </feature>
+  <feature type="helix">
+    <location><begin position="1"/><end position="2"/></location>
+  </feature>
+  <feature type="sequence variant" description="in dbSNP">
+    <location><position position="4"/></location>
+  </feature>
+  <feature type="chain" description="Synthetic protein">
+    <location><begin position="1"/><end position="6"/></location>
+  </feature>
+  <sequence length="6">NCCACC</sequence>
+</entry>
+</uniprot>
+"""
+
+
+def table_rows(df):
+    return [[str(value) for value in row] for row in df.iter_rows()]
+
+
+@pytest.fixture
+def synthetic(tmp_path, monkeypatch):
+    (tmp_path / "test").mkdir()
+    (tmp_path / "test" / "SYN.xml").write_text(SYNTHETIC_ENTRY, encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    return get_uniprot_data("SYN")
+
+
+@pytest.mark.parametrize("uniprot_id", sorted(BASELINE_DIGESTS))
+def test_bundled_entries_match_baseline(uniprot_id, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    df = create_dataframe(*get_uniprot_data(uniprot_id))
+    payload = json.dumps([df.columns, table_rows(df)])
+    assert hashlib.sha256(payload.encode()).hexdigest() == BASELINE_DIGESTS[uniprot_id]
+
+
+def test_bundled_insulin_disulfide_bridges(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    df = create_dataframe(*get_uniprot_data("P01308"))
+    bridges = df["Disulfide bridges"].to_list()
+    assert bridges[30] == "Cys-96"
+    assert bridges[95] == "Cys-31"
+
+
+def test_sequence_ignores_isoform_sequences(synthetic):
+    protein_sequence, _ = synthetic
+    assert protein_sequence == "NCCACC"
+
+
+def test_uninteresting_features_are_skipped(synthetic):
+    _, annotations = synthetic
+    assert sorted(annotations) == ["disulfide bond", "glycosylation site", "helix"]
+
+
+def test_position_features_are_single_residue_ranges(synthetic):
+    _, annotations = synthetic
+    assert annotations["glycosylation site"] == {
+        "begin": [1],
+        "end": [1],
+        "desc": ["N-linked"],
+    }
+
+
+def test_position_disulfide_bond_uses_description(synthetic):
+    df = create_dataframe(*synthetic)
+    assert df["Disulfide bridges"].to_list() == [
+        "",
+        "Cys-5",
+        "Interchain (with C-12)",
+        "",
+        "Cys-2",
+        "",
+    ]
+    assert df["Glycosylation sites"].to_list()[0] == "N-linked"
+    assert df["Secondary structure"].to_list()[:3] == ["HELIX", "HELIX", ""]
@@ -1,8 +1,193 @@
+import gzip
+import io
+import json
 import os
-import xml.etree.ElementTree as ET
-from urllib.request import urlopen
+import tempfile
+import time
+from collections import defaultdict
+from urllib.parse import quote
+
+import numpy as np
+import requests
+from lxml import etree as ET
+
+UNIPROT_NS = "http://uniprot.org/uniprot"
+
+# XPath expressions compiled once and reused for every feature element
+_NS = {"up": UNIPROT_NS}
+_LOCATION = ET.XPath("up:location", namespaces=_NS)
+_POSITION = ET.XPath("up:location/up:position", namespaces=_NS)
+_BEGIN = ET.XPath("up:location/up:begin", namespaces=_NS)
+_END = ET.XPath("up:location/up:end", namespaces=_NS)
+
+# Per-residue annotation columns, in display order
+ANNOTATION_COLUMNS = [
+    "Secondary structure",
+    "Domain",
+    "Pfam domain",
+    "Disorder",
+    "Disulfide bridges",
+    "Glycosylation sites",
+    "Phosphorylation sites",
+    "active sites",
+    "Binding sites",  # Combined binding sites column
+    "modified",
+]
+
+# Columns with few distinct, long-repeating values, stored as categoricals
+CATEGORICAL_COLUMNS = ["Secondary structure", "Pfam domain", "Disorder"]
+
+# Map UniProt feature types handled by _fill_generic to our column names
+FEATURE_MAPPING = {
+    "strand": "Secondary structure",
+    "helix": "Secondary structure",
+    "turn": "Secondary structure",
+    "domain": "Domain",
+    "modified residue": "modified",
+    "active site": "active sites",
+    "site": "Phosphorylation sites",
+}
+
+# Region descriptions are mapped to columns by keyword, checked in order
+REGION_MAPPING = {"pfam": "Pfam domain", "disorder": "Disorder"}
+
+# Shared session so repeated fetches reuse the keep-alive TLS connection
+_SESSION = requests.Session()
+_SESSION.headers["Accept-Encoding"] = "gzip"
+
+# Cached entries younger than this are served without contacting UniProt
+CACHE_MAX_AGE = 7 * 24 * 3600
+
+# At most this many entries are kept on disk; the least recently fetched go first
+CACHE_MAX_ENTRIES = 64
+
+
+def _cache_dir():
+    """
+    Returns the directory holding cached UniProt XML files, creating it if needed.
+    """
+    candidates = [
+        os.path.join(os.path.expanduser("~"), ".cache", "sequencetable"),
+        os.path.join(tempfile.gettempdir(), "sequencetable"),
+    ]
+    for path in candidates:
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError:
+            continue
+        if os.access(path, os.W_OK):
+            return path
+    return None
+
+
+def _write_atomic(path, data):
+    """
+    Writes bytes to path via a temporary file so readers never see partial data.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _prune_cache(cache_dir):
+    """
+    Removes the oldest cached entries (by mtime) beyond CACHE_MAX_ENTRIES.
+    """
+    try:
+        entries = []
+        for name in os.listdir(cache_dir):
+            if name.endswith(".xml.gz"):
+                path = os.path.join(cache_dir, name)
+                entries.append((os.path.getmtime(path), path))
+    except OSError:
+        return
+    entries.sort(reverse=True)
+    for _, path in entries[CACHE_MAX_ENTRIES:]:
+        for stale in (path, path[: -len(".xml.gz")] + ".json"):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def local_xml_path(uniprot_id):
+    """
+    Returns the path of the bundled XML file used instead of UniProt for an ID.
+    """
+    return os.path.join("test", f"{uniprot_id}.xml")
+
+
+def fetch_uniprot_xml(uniprot_id):
+    """
+    Fetches the raw UniProt XML for an ID, using a bounded on-disk gzip cache.
 
-import pandas as pd
+    Fresh cache entries are returned without network access. Stale entries are
+    revalidated with the stored ETag/Last-Modified headers and reused when
+    UniProt answers 304 Not Modified or cannot be reached.
+
+    Args:
+        uniprot_id: The UniProt ID of the protein.
+
+    Returns:
+        The XML document as bytes.
+    """
+    cache_dir = _cache_dir()
+    xml_path = meta_path = None
+    cached = None
+    meta = {}
+    if cache_dir is not None:
+        name = quote(uniprot_id, safe="")
+        xml_path = os.path.join(cache_dir, f"{name}.xml.gz")
+        meta_path = os.path.join(cache_dir, f"{name}.json")
+        try:
+            with gzip.open(xml_path, "rb") as file:
+                cached = file.read()
+            if time.time() - os.path.getmtime(xml_path) < CACHE_MAX_AGE:
+                return cached
+            with open(meta_path, "r", encoding="utf-8") as file:
+                meta = json.load(file)
+        except (OSError, EOFError, ValueError):
+            pass
+
+    headers = {}
+    if cached is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    url = f"https://www.uniprot.org/uniprot/{uniprot_id}.xml"
+    try:
+        response = _SESSION.get(url, headers=headers, timeout=30)
+        response.raise_for_status()
+    except requests.RequestException:
+        if cached is None:
+            raise
+        # UniProt unreachable or failing: keep serving the stale copy
+        return cached
+    if response.status_code == 304 and cached is not None:
+        # Not modified: refresh the timestamp and keep serving the cached copy
+        try:
+            os.utime(xml_path)
+        except OSError:
+            pass
+        return cached
+    data = response.content
+    meta = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+    if xml_path is not None:
+        _write_atomic(xml_path, gzip.compress(data))
+        _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+        _prune_cache(cache_dir)
+    return data
 
 
 def get_uniprot_data(uniprot_id):
@@ -15,202 +200,207 @@ def get_uniprot_data(uniprot_id):
     Returns:
         A tuple containing:
         - protein_sequence: The protein sequence as a string.
-        - annotations: A dictionary containing annotations.
+        - annotations: A dictionary mapping each feature type to parallel
+          "begin", "end" and "desc" lists.
         - error_message: An error message if something goes wrong, otherwise None
     """
-    # Fetch XML data
-    local_file_path = os.path.join("test", f"{uniprot_id}.xml")
+    # Open XML data as a stream
+    local_file_path = local_xml_path(uniprot_id)
     if os.path.exists(local_file_path):
-        with open(local_file_path, "r", encoding="utf-8") as file:
-            response = file.read()
+        source = open(local_file_path, "rb")
     else:
-        # Fetch XML data from UniProt
-        url = f"https://www.uniprot.org/uniprot/{uniprot_id}.xml"
-        response = urlopen(url).read().decode("utf-8")
+        # Fetch XML data from UniProt (or the local cache)
+        source = io.BytesIO(fetch_uniprot_xml(uniprot_id))
 
-    # Parse XML with namespace
-    root = ET.fromstring(response)
-    ns = {"up": "http://uniprot.org/uniprot"}
+    entry_tag = f"{{{UNIPROT_NS}}}entry"
+    feature_tag = f"{{{UNIPROT_NS}}}feature"
+    sequence_tag = f"{{{UNIPROT_NS}}}sequence"
 
-    # Get sequence
-    sequence_elem = root.find("./up:entry/up:sequence", ns)
-    if sequence_elem is None:
+    # Parse incrementally, discarding each element once it has been handled,
+    # so that only one feature is held in memory at a time
+    protein_sequence = None
+    annotations = {}
+    desc_pool = {}
+    with source:
+        for _, elem in ET.iterparse(
+            source, events=("end",), tag=(feature_tag, sequence_tag)
+        ):
+            if elem.tag == sequence_tag:
+                # Isoform sequences are nested deeper and carry no residues
+                if protein_sequence is None and elem.getparent().tag == entry_tag:
+                    protein_sequence = elem.text.strip()
+            else:
+                _add_feature(annotations, elem, desc_pool)
+
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+    if protein_sequence is None:
         return None, None, "Could not find sequence in UniProt response"
-    protein_sequence = sequence_elem.text.strip()
 
-    # Get feature annotations
-    annotations = {}
-    for feature in root.findall(".//up:feature", ns):
-        feature_type = feature.get("type")
-        description = feature.get("description", "")
+    return protein_sequence, annotations
+
+
+def _add_feature(annotations, feature, desc_pool):
+    """
+    Appends the position information of a single feature element to annotations.
+
+    Descriptions are interned through desc_pool so repeated ones share a string.
+    """
+    get = feature.get
+    feature_type = get("type")
+    # Skip features (variants, conflicts, chains, ...) no column displays
+    if feature_type is None or feature_type.lower() not in INTERESTING_FEATURES:
+        return
+    description = get("description", "")
+    description = desc_pool.setdefault(description, description)
+
+    # Get position information
+    if not _LOCATION(feature):
+        return
+
+    # Handle different types of position elements
+    position = _POSITION(feature)
+    begin = _BEGIN(feature)
+    end_elem = _END(feature)
+
+    if position:
+        # Single position features are stored as one-residue ranges
+        start = end = int(position[0].get("position"))
+    elif begin and end_elem:
+        # For range features and disulfide bonds
+        start = int(begin[0].get("position"))
+        end = int(end_elem[0].get("position"))
+    else:
+        return
+
+    # Features are stored column-wise, as parallel lists per feature type
+    columns = annotations.get(feature_type)
+    if columns is None:
+        columns = annotations[feature_type] = {"begin": [], "end": [], "desc": []}
+    columns["begin"].append(start)
+    columns["end"].append(end)
+    columns["desc"].append(description)
+
+
+def _append_range(parts, start, end, desc):
+    """
+    Appends a description to the per-residue lists covering residues
+    start..end (1-based, inclusive).
+    """
+    if not desc:
+        return
+    for cell in parts[start - 1 : end]:
+        cell.append(desc)
+
+
+def _fill_disulfide(feature_type, values, cols, overlays):
+    """
+    Marks each bonded cysteine with the position of its partner.
 
-        # Get position information
-        location = feature.find("up:location", ns)
-        if location is None:
+    Interchain bonds are given as a single position, with no partner residue in
+    this sequence; those are labelled with their description instead.
+    """
+    for start, end, desc in zip(values["begin"], values["end"], values["desc"]):
+        if start == end:
+            if desc:
+                cols["Disulfide bridges"][start - 1] = desc
             continue
+        cols["Disulfide bridges"][start - 1] = f"Cys-{end}"
+        cols["Disulfide bridges"][end - 1] = f"Cys-{start}"
 
-        # Handle different types of position elements
-        position = location.find("up:position", ns)
-        begin = location.find("up:begin", ns)
-        end_elem = location.find("up:end", ns)
-
-        if position is not None:
-            pos = int(position.get("position"))
-            # For single position features
-            if feature_type not in annotations:
-                annotations[feature_type] = []
-            annotations[feature_type].append(
-                {"position": pos, "description": description}
-            )
-        elif begin is not None and end_elem is not None:
-            start = int(begin.get("position"))
-            end = int(end_elem.get("position"))
-            # For range features and disulfide bonds
-            if feature_type not in annotations:
-                annotations[feature_type] = []
-            annotations[feature_type].append(
-                {"begin": start, "end": end, "description": description}
-            )
 
-    return protein_sequence, annotations
+def _fill_glycosylation(feature_type, values, cols, overlays):
+    """
+    Writes glycosylation descriptions at their single-residue positions.
+    """
+    positions = np.asarray(values["begin"]) - 1
+    cols["Glycosylation sites"][positions] = values["desc"]
+
+
+def _fill_region(feature_type, values, cols, overlays):
+    """
+    Routes region features to a column chosen by keywords in their description.
+    """
+    for start, end, desc in zip(values["begin"], values["end"], values["desc"]):
+        desc_lc = desc.lower()
+
+        # Map to appropriate column based on description
+        for keyword, column in REGION_MAPPING.items():
+            if keyword in desc_lc:
+                _append_range(overlays[column], start, end, desc_lc)
+                break
+
+
+def _fill_binding_site(feature_type, values, cols, overlays):
+    """
+    Collects binding site descriptions into the combined binding sites column.
+    """
+    for start, end, desc in zip(values["begin"], values["end"], values["desc"]):
+        _append_range(overlays["Binding sites"], start, end, desc)
+
+
+def _fill_generic(feature_type, values, cols, overlays):
+    """
+    Handles feature types mapped directly to a column by FEATURE_MAPPING.
+    """
+    column = FEATURE_MAPPING.get(feature_type)
+    if not column:
+        return
+
+    if column == "Secondary structure":
+        label = feature_type.upper()
+        for start, end in zip(values["begin"], values["end"]):
+            cols[column][start - 1 : end] = label
+    else:
+        for start, end, desc in zip(values["begin"], values["end"], values["desc"]):
+            _append_range(overlays[column], start, end, desc)
+
+
+# Feature types needing special handling; the rest go through _fill_generic
+HANDLERS = {
+    "disulfide bond": _fill_disulfide,
+    "glycosylation site": _fill_glycosylation,
+    "region": _fill_region,
+    "binding site": _fill_binding_site,
+}
+
+# Feature types that end up in some column, whether mapped directly or through a
+# dedicated handler; everything else is skipped on parse
+INTERESTING_FEATURES = set(FEATURE_MAPPING) | set(HANDLERS)
 
 
 def create_dataframe(protein_sequence, annotations):
     """
-    Creates a Pandas DataFrame from protein sequence and annotations.
-    """
-    data = []
-    for i, residue in enumerate(protein_sequence):
-        residue_number = i + 1
-        row = {
-            "Residue Number": residue_number,
-            "Residue code": residue,
-            "Secondary structure": "",
-            "Domain": "",
-            "Pfam domain": "",
-            "Disorder": "",
-            "Disulfide bridges": "",
-            "Glycosylation sites": "",
-            "Phosphorylation sites": "",
-            "active sites": "",
-            "Binding sites": "",  # Combined binding sites column
-            "modified": "",
-        }
-        data.append(row)
-
-    df = pd.DataFrame(data)
-
-    # Map UniProt feature types to our column names
-    feature_mapping = {
-        "strand": "Secondary structure",
-        "helix": "Secondary structure",
-        "turn": "Secondary structure",
-        "domain": "Domain",
-        "disulfide bond": "Disulfide bridges",
-        "glycosylation site": "Glycosylation sites",
-        "modified residue": "modified",
-        "active site": "active sites",
-        "site": "Phosphorylation sites",
+    Creates a Polars DataFrame from protein sequence and annotations.
+    """
+    # Imported lazily: polars is slow to import and only needed here
+    import polars as pl
+
+    n = len(protein_sequence)
+    cols = {
+        "Residue Number": np.arange(1, n + 1, dtype=np.int32),
+        "Residue code": np.frombuffer(
+            protein_sequence.encode("ascii"), dtype="S1"
+        ).astype("U1"),
     }
+    for column in ANNOTATION_COLUMNS:
+        cols[column] = np.empty(n, dtype=object)
+        cols[column][:] = ""
 
-    # Special mappings that need additional processing
-    region_mapping = {"pfam": "Pfam domain", "disorder": "Disorder"}
+    # Multi-valued columns collect descriptions per residue and are joined
+    # once at the end, rather than re-concatenating a growing string
+    overlays = defaultdict(lambda: [[] for _ in range(n)])
 
     for feature_type, values in annotations.items():
         feature_type = feature_type.lower()
+        HANDLERS.get(feature_type, _fill_generic)(feature_type, values, cols, overlays)
+
+    for column, parts in overlays.items():
+        cols[column] = np.fromiter(
+            ("; ".join(cell) for cell in parts), dtype=object, count=n
+        )
 
-        # Handle disulfide bond pairs
-        if feature_type == "disulfide bond":
-            for item in values:
-                start = item["begin"]
-                end = item["end"]
-                desc = f"Cys-{end}"
-                df.at[start - 1, "Disulfide bridges"] = desc
-                desc = f"Cys-{start}"
-                df.at[end - 1, "Disulfide bridges"] = desc
-
-        # Handle glycosylation sites
-        elif feature_type == "glycosylation site":
-            for item in values:
-                pos = item["position"] - 1
-                df.at[pos, "Glycosylation sites"] = item["description"]
-
-        # Handle region features
-        elif feature_type == "region":
-            for item in values:
-                start = item.get("begin", item.get("position"))
-                end = item.get("end", item.get("position"))
-                if not start:
-                    continue
-
-                start = int(start)
-                end = int(end) if end else start
-                desc = item["description"].lower()
-
-                # Map to appropriate column based on description
-                column = None
-                if "pfam" in desc:
-                    column = "Pfam domain"
-                elif "disorder" in desc:
-                    column = "Disorder"
-
-                if column:
-                    for i in range(start - 1, end):
-                        if i >= len(df):
-                            continue
-                        current = df.at[i, column]
-                        if isinstance(current, str) and current != "" and desc:
-                            df.at[i, column] = f"{current}; {desc}"
-                        elif desc:
-                            df.at[i, column] = desc
-
-        # Handle binding site features
-        elif feature_type == "binding site":
-            for item in values:
-                start = item.get("begin", item.get("position"))
-                end = item.get("end", item.get("position"))
-                if not start:
-                    continue
-
-                start = int(start)
-                end = int(end) if end else start
-                desc = item["description"]
-
-                for i in range(start - 1, end):
-                    if i >= len(df):
-                        continue
-                    current = df.at[i, "Binding sites"]
-                    if isinstance(current, str) and current != "" and desc:
-                        df.at[i, "Binding sites"] = f"{current}; {desc}"
-                    elif desc:
-                        df.at[i, "Binding sites"] = desc
-
-        # Handle other features
-        else:
-            column = feature_mapping.get(feature_type)
-            if not column:
-                continue
-
-            for item in values:
-                start = item.get("begin", item.get("position"))
-                end = item.get("end", item.get("position"))
-                if not start:
-                    continue
-
-                start = int(start)
-                end = int(end) if end else start
-
-                for i in range(start - 1, end):
-                    if i >= len(df):
-                        continue
-                    if column == "Secondary structure":
-                        df.at[i, column] = feature_type.upper()
-                    else:
-                        current = df.at[i, column]
-                        desc = item["description"]
-                        if isinstance(current, str) and current != "" and desc:
-                            df.at[i, column] = f"{current}; {desc}"
-                        elif desc:
-                            df.at[i, column] = desc
-
-    return df
\ No newline at end of file
+    df = pl.DataFrame(cols)
+    return df.with_columns(pl.col(CATEGORICAL_COLUMNS).cast(pl.Categorical))